@@ -2,80 +2,70 @@
 // Create React-Compatible Plugin for Your System
 // scripts/create-react-plugin.js
 
-const fs = require('fs').promises
+const fs = require('fs')
 const path = require('path')
 const archiver = require('archiver')
-
-async function createReactPlugin() {
-  console.log('🚀 Creating React-Compatible Plugin for Your System...')
-  
-  const pluginDir = path.join(process.cwd(), 'plugins', 'react-compatible', 'hello-world')
-  
-  try {
-    // Create the directory structure your system expects
-    await fs.mkdir(pluginDir, { recursive: true })
-    await fs.mkdir(path.join(pluginDir, 'routes'), { recursive: true })
-    await fs.mkdir(path.join(pluginDir, 'components'), { recursive: true })
-    
-    // Plugin Manifest - Correct paths for your system
-    const manifest = {
-      "id": "hello-world",
-      "name": "Hello World Plugin",
-      "version": "1.0.0",
-      "description": "A React-compatible plugin that works with your existing loader",
-      "author": {
-        "name": "Plugin Developer",
-        "email": "dev@example.com",
-        "url": "https://example.com"
-      },
-      "license": "MIT",
-      "category": "utility",
-      "keywords": ["test", "react", "hello"],
-      "tags": ["demo", "react"],
-      "requirements": {
-        "nextjs": ">=15.0.0"
-      },
-      "permissions": [
-        "admin:access",
-        "api:create"
-      ],
-      "entry": {
-        "main": "index.js",
-        "admin": "components/admin.js",
-        "api": "routes/api.js"
-      },
-      "routes": [
-        {
-          "path": "/hello",
-          "method": "GET",
-          "handler": "api.js",
-          "permissions": ["api:create"]
-        }
-      ],
-      "adminPages": [
-        {
-          "path": "/hello-world",
-          "title": "Hello World",
-          "icon": "Heart",
-          "component": "admin.js",
-          "permissions": ["admin:access"],
-          "order": 1
-        }
-      ],
-      "dashboardWidgets": [
-        {
-          "id": "hello-widget",
-          "title": "Hello Widget",
-          "component": "widget.js",
-          "size": "small",
-          "permissions": ["admin:access"],
-          "configurable": false
-        }
-      ]
+const { batchCreate, flattenTree, packTree, syncAll } = require('./scaffold')
+
+// Plugin Manifest - Correct paths for your system
+const manifest = {
+  "id": "hello-world",
+  "name": "Hello World Plugin",
+  "version": "1.0.0",
+  "description": "A React-compatible plugin that works with your existing loader",
+  "author": {
+    "name": "Plugin Developer",
+    "email": "dev@example.com",
+    "url": "https://example.com"
+  },
+  "license": "MIT",
+  "category": "utility",
+  "keywords": ["test", "react", "hello"],
+  "tags": ["demo", "react"],
+  "requirements": {
+    "nextjs": ">=15.0.0"
+  },
+  "permissions": [
+    "admin:access",
+    "api:create"
+  ],
+  "entry": {
+    "main": "index.js",
+    "admin": "components/admin.js",
+    "api": "routes/api.js"
+  },
+  "routes": [
+    {
+      "path": "/hello",
+      "method": "GET",
+      "handler": "api.js",
+      "permissions": ["api:create"]
     }
-    
-    // Main Plugin File - CommonJS
-    const indexJs = `// Hello World Plugin - Main Entry (CommonJS)
+  ],
+  "adminPages": [
+    {
+      "path": "/hello-world",
+      "title": "Hello World",
+      "icon": "Heart",
+      "component": "admin.js",
+      "permissions": ["admin:access"],
+      "order": 1
+    }
+  ],
+  "dashboardWidgets": [
+    {
+      "id": "hello-widget",
+      "title": "Hello Widget",
+      "component": "widget.js",
+      "size": "small",
+      "permissions": ["admin:access"],
+      "configurable": false
+    }
+  ]
+}
+
+// Main Plugin File - CommonJS
+const indexJs = `// Hello World Plugin - Main Entry (CommonJS)
 function HelloWorldPlugin(api) {
   this.api = api
   this.initialized = false
@@ -129,8 +119,8 @@ HelloWorldPlugin.prototype.cleanup = function() {
 // CommonJS export
 module.exports = HelloWorldPlugin`
 
-    // API Route Handler - In routes/ directory (CommonJS)
-    const routesApiJs = `// Hello World Plugin - API Handler (CommonJS)
+// API Route Handler - In routes/ directory (CommonJS)
+const routesApiJs = `// Hello World Plugin - API Handler (CommonJS)
 function handleRequest(request, context) {
   return new Promise(function(resolve) {
     try {
@@ -201,8 +191,8 @@ module.exports.default = handleRequest
 module.exports.handleRequest = handleRequest
 module.exports.GET = handleRequest`
 
-    // React Admin Component - Proper React component function
-    const componentsAdminJs = `// Hello World Plugin - React Admin Component
+// React Admin Component - Proper React component function
+const componentsAdminJs = `// Hello World Plugin - React Admin Component
 // This is a proper React component function that your loader expects
 
 function HelloWorldAdmin(props) {
@@ -423,8 +413,8 @@ function HelloWorldAdmin(props) {
 // Export as React component function (what your loader expects)
 module.exports = HelloWorldAdmin`
 
-    // React Widget Component - Proper React component function
-    const componentsWidgetJs = `// Hello World Plugin - React Widget Component
+// React Widget Component - Proper React component function
+const componentsWidgetJs = `// Hello World Plugin - React Widget Component
 // This is a proper React component function
 
 function HelloWorldWidget(props) {
@@ -644,8 +634,8 @@ function HelloWorldWidget(props) {
 // Export as React component function
 module.exports = HelloWorldWidget`
 
-    // README
-    const readme = `# Hello World Plugin - React Compatible
+// README
+const readme = `# Hello World Plugin - React Compatible
 
 This plugin is designed to work with your existing React component loader.
 
@@ -715,17 +705,41 @@ After uploading this plugin:
 
 This should resolve all the React component loading errors! 🚀`
 
-    // Write all files
-    await fs.writeFile(path.join(pluginDir, 'plugin.json'), JSON.stringify(manifest, null, 2))
-    await fs.writeFile(path.join(pluginDir, 'index.js'), indexJs)
-    await fs.writeFile(path.join(pluginDir, 'README.md'), readme)
-    
-    // Routes directory
-    await fs.writeFile(path.join(pluginDir, 'routes', 'api.js'), routesApiJs)
+// Plugin tree as frozen [relPath, Buffer] entries, packed once at load
+const SKELETON = packTree(flattenTree({
+  'plugin.json': JSON.stringify(manifest, null, 2),
+  'index.js': indexJs,
+  'README.md': readme,
+  // Routes directory
+  routes: {
+    'api.js': routesApiJs
+  },
+  // Components directory - React components
+  components: {
+    'admin.js': componentsAdminJs,
+    'widget.js': componentsWidgetJs
+  }
+}))
+
+async function createReactPlugin({ durable = false } = {}) {
+  console.log('🚀 Creating React-Compatible Plugin for Your System...')
+  
+  const pluginDir = path.join(process.cwd(), 'plugins', 'react-compatible', 'hello-world')
+  
+  const zipPath = path.join(path.dirname(pluginDir), 'hello-world-react.zip')
+  
+  try {
+    // The plugin tree and its ZIP are both built from SKELETON and share no
+    // state, so write them concurrently
+    await Promise.all([
+      batchCreate(pluginDir, SKELETON),
+      createZipFile(SKELETON, zipPath)
+    ])
     
-    // Components directory - React components
-    await fs.writeFile(path.join(pluginDir, 'components', 'admin.js'), componentsAdminJs)
-    await fs.writeFile(path.join(pluginDir, 'components', 'widget.js'), componentsWidgetJs)
+    // Flush only once both writes are done, so the ZIP is covered too
+    if (durable) {
+      await syncAll([...SKELETON.map(([relPath]) => path.join(pluginDir, relPath)), zipPath])
+    }
     
     console.log('✅ React-compatible plugin files created!')
     console.log(`📁 Location: ${pluginDir}`)
@@ -739,10 +753,6 @@ This should resolve all the React component loading errors! 🚀`
     console.log('│   └── widget.js        ← React component function')
     console.log('└── README.md')
     
-    // Create ZIP file
-    const zipPath = path.join(path.dirname(pluginDir), 'hello-world-react.zip')
-    await createZipFile(pluginDir, zipPath)
-    
     console.log(`\n📦 ZIP package created: ${zipPath}`)
     console.log('\n🎯 This plugin has REAL React components!')
     console.log('\n✅ Expected results:')
@@ -760,9 +770,13 @@ This should resolve all the React component loading errors! 🚀`
   }
 }
 
-async function createZipFile(sourceDir, outputPath) {
+// Build the ZIP straight from the in-memory file list rather than walking
+// and re-reading the directory that was just written.
+async function createZipFile(files, outputPath) {
+  await fs.promises.mkdir(path.dirname(outputPath), { recursive: true })
+
   return new Promise((resolve, reject) => {
-    const output = require('fs').createWriteStream(outputPath)
+    const output = fs.createWriteStream(outputPath)
     const archive = archiver('zip', { zlib: { level: 9 } })
     
     output.on('close', () => {
@@ -772,7 +786,9 @@ async function createZipFile(sourceDir, outputPath) {
     
     archive.on('error', reject)
     archive.pipe(output)
-    archive.directory(sourceDir, false)
+    for (const [relPath, content] of files) {
+      archive.append(content, { name: relPath })
+    }
     archive.finalize()
   })
 }
@@ -845,7 +861,7 @@ export async function POST(
 
 // Run if called directly
 if (require.main === module) {
-  createReactPlugin()
+  createReactPlugin({ durable: process.argv.includes('--durable') })
   
   console.log('\n\n🔧 ALSO NEED TO CREATE DEACTIVATE ROUTE:')
   console.log('Create: src/app/api/admin/plugins/[id]/deactivate/route.ts')
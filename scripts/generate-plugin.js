@@ -5,6 +5,15 @@
 const fs = require('fs').promises
 const path = require('path')
 const readline = require('readline')
+const { batchCreate, syncAll } = require('./scaffold')
+
+// Optional plugin parts: feature flag -> method that queues its files
+const FEATURE_CREATORS = {
+  adminPages: 'createAdminPages',
+  dashboardWidgets: 'createDashboardWidgets',
+  apiRoutes: 'createApiRoutes',
+  database: 'createDatabaseModels'
+}
 
 class PluginCLI {
   constructor() {
@@ -20,7 +29,7 @@ class PluginCLI {
     })
   }
 
-  async generatePlugin() {
+  async generatePlugin(options = {}) {
     console.log('🚀 Plugin Template Generator')
     console.log('================================\n')
 
@@ -29,7 +38,7 @@ class PluginCLI {
       const pluginInfo = await this.collectPluginInfo()
       
       // Generate plugin files
-      await this.createPluginFiles(pluginInfo)
+      await this.createPluginFiles(pluginInfo, options)
       
       console.log('\n✅ Plugin template generated successfully!')
       console.log(`📁 Location: ./plugins/templates/${pluginInfo.id}`)
@@ -102,37 +111,38 @@ class PluginCLI {
       .replace(/(^-|-$)/g, '')
   }
 
-  async createPluginFiles(info) {
+  async createPluginFiles(info, { durable = false } = {}) {
     const pluginDir = path.join('./plugins/templates', info.id)
-    
-    // Create plugin directory
-    await fs.mkdir(pluginDir, { recursive: true })
 
-    // Generate all plugin files
-    await this.createManifest(pluginDir, info)
-    await this.createMainFile(pluginDir, info)
-    
-    if (info.features.adminPages) {
-      await this.createAdminPages(pluginDir, info)
-    }
-    
-    if (info.features.dashboardWidgets) {
-      await this.createDashboardWidgets(pluginDir, info)
+    // Queue all plugin files, then create their directories and write them in a single batch
+    const files = []
+    await this.createManifest(info, files)
+    await this.createMainFile(info, files)
+
+    for (const [feature, creator] of Object.entries(FEATURE_CREATORS)) {
+      if (info.features[feature]) {
+        await this[creator](info, files)
+      }
     }
-    
-    if (info.features.apiRoutes) {
-      await this.createApiRoutes(pluginDir, info)
+
+    await this.createReadme(info, files)
+    await this.createPackageScript(info, files)
+
+    await batchCreate(pluginDir, files)
+
+    // Make the package script executable
+    try {
+      await fs.chmod(path.join(pluginDir, 'package.sh'), 0o755)
+    } catch (error) {
+      // Ignore chmod errors on systems that don't support it
     }
-    
-    if (info.features.database) {
-      await this.createDatabaseModels(pluginDir, info)
+
+    if (durable) {
+      await syncAll(files.map(([relPath]) => path.join(pluginDir, relPath)))
     }
-    
-    await this.createReadme(pluginDir, info)
-    await this.createPackageScript(pluginDir, info)
   }
 
-  async createManifest(pluginDir, info) {
+  async createManifest(info, files) {
     const manifest = {
       id: info.id,
       name: info.name,
@@ -216,13 +226,10 @@ class PluginCLI {
       }
     }
 
-    await fs.writeFile(
-      path.join(pluginDir, 'plugin.json'),
-      JSON.stringify(manifest, null, 2)
-    )
+    files.push(['plugin.json', JSON.stringify(manifest, null, 2)])
   }
 
-  async createMainFile(pluginDir, info) {
+  async createMainFile(info, files) {
     const mainContent = `// ${info.name} - Main Plugin File
 // Generated by Plugin CLI Generator
 
@@ -320,12 +327,10 @@ module.exports = {
   }
 }`
 
-    await fs.writeFile(path.join(pluginDir, 'index.js'), mainContent)
+    files.push(['index.js', mainContent])
   }
 
-  async createAdminPages(pluginDir, info) {
-    await fs.mkdir(path.join(pluginDir, 'admin'), { recursive: true })
-    
+  async createAdminPages(info, files) {
     const adminContent = `// ${info.name} Admin Settings Page
 import React, { useState, useEffect } from 'react'
 
@@ -426,12 +431,10 @@ export default function ${info.id.replace(/-/g, '')}Settings() {
   )
 }`
 
-    await fs.writeFile(path.join(pluginDir, 'admin/settings.jsx'), adminContent)
+    files.push(['admin/settings.jsx', adminContent])
   }
 
-  async createDashboardWidgets(pluginDir, info) {
-    await fs.mkdir(path.join(pluginDir, 'widgets'), { recursive: true })
-    
+  async createDashboardWidgets(info, files) {
     const widgetContent = `// ${info.name} Dashboard Widget
 import React, { useState, useEffect } from 'react'
 
@@ -503,12 +506,10 @@ export default function ${info.id.replace(/-/g, '')}Stats() {
   )
 }`
 
-    await fs.writeFile(path.join(pluginDir, 'widgets/stats.jsx'), widgetContent)
+    files.push(['widgets/stats.jsx', widgetContent])
   }
 
-  async createApiRoutes(pluginDir, info) {
-    await fs.mkdir(path.join(pluginDir, 'routes'), { recursive: true })
-    
+  async createApiRoutes(info, files) {
     // Status route
     const statusContent = `// ${info.name} Status API Route
 module.exports = async function statusHandler(req, res, context) {
@@ -536,7 +537,7 @@ module.exports = async function statusHandler(req, res, context) {
   }
 }`
 
-    await fs.writeFile(path.join(pluginDir, 'routes/status.js'), statusContent)
+    files.push(['routes/status.js', statusContent])
 
     // Config route
     const configContent = `// ${info.name} Config API Route
@@ -590,12 +591,10 @@ module.exports = {
   }
 }`
 
-    await fs.writeFile(path.join(pluginDir, 'routes/config.js'), configContent)
+    files.push(['routes/config.js', configContent])
   }
 
-  async createDatabaseModels(pluginDir, info) {
-    await fs.mkdir(path.join(pluginDir, 'models'), { recursive: true })
-    
+  async createDatabaseModels(info, files) {
     const modelContent = `// ${info.name} Database Model
 const mongoose = require('mongoose')
 
@@ -631,10 +630,10 @@ ${info.id.replace(/-/g, '')}Schema.pre('save', function(next) {
 
 module.exports = mongoose.model('${info.name.replace(/\s+/g, '')}', ${info.id.replace(/-/g, '')}Schema)`
 
-    await fs.writeFile(path.join(pluginDir, 'models/index.js'), modelContent)
+    files.push(['models/index.js', modelContent])
   }
 
-  async createReadme(pluginDir, info) {
+  async createReadme(info, files) {
     const readmeContent = `# ${info.name}
 
 ${info.description}
@@ -698,10 +697,10 @@ ${info.license || 'MIT'}
 ${info.author} <${info.email}>
 `
 
-    await fs.writeFile(path.join(pluginDir, 'README.md'), readmeContent)
+    files.push(['README.md', readmeContent])
   }
 
-  async createPackageScript(pluginDir, info) {
+  async createPackageScript(info, files) {
     const packageContent = `#!/bin/bash
 # Package ${info.name} for distribution
 
@@ -715,21 +714,14 @@ echo "✅ Plugin packaged as ${info.id}.zip"
 echo "📁 Ready for upload!"
 `
 
-    await fs.writeFile(path.join(pluginDir, 'package.sh'), packageContent)
-    
-    // Make it executable
-    try {
-      await fs.chmod(path.join(pluginDir, 'package.sh'), 0o755)
-    } catch (error) {
-      // Ignore chmod errors on systems that don't support it
-    }
+    files.push(['package.sh', packageContent])
   }
 }
 
 // Run the CLI
 if (require.main === module) {
   const cli = new PluginCLI()
-  cli.generatePlugin().catch(console.error)
+  cli.generatePlugin({ durable: process.argv.includes('--durable') }).catch(console.error)
 }
 
 module.exports = PluginCLI
\ No newline at end of file
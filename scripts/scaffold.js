@@ -0,0 +1,186 @@
+// Shared helpers for the scaffolding scripts
+// scripts/scaffold.js
+
+const fs = require('fs').promises
+const path = require('path')
+const { execFile } = require('child_process')
+const { promisify } = require('util')
+
+const execFileAsync = promisify(execFile)
+
+const MAX_CONCURRENT_WRITES = 8
+
+// File content is a string, a Buffer, or an array of those parts (e.g. a
+// license header followed by a body) that are written back to back.
+function toBuffer(part) {
+  return typeof part === 'string' ? Buffer.from(part) : part
+}
+
+// Flatten a nested { name: content | { ... } } tree into [relPath, content]
+// entries. Strings, Buffers and part arrays are files; plain objects are
+// directories.
+function flattenTree(spec, prefix = '') {
+  const files = []
+  for (const [name, value] of Object.entries(spec)) {
+    const relPath = prefix + name
+    if (typeof value === 'string' || Buffer.isBuffer(value) || Array.isArray(value)) {
+      files.push([relPath, value])
+    } else {
+      files.push(...flattenTree(value, relPath + '/'))
+    }
+  }
+  return files
+}
+
+// Encode [relPath, content] entries into one contiguous blob and return
+// frozen entries whose contents are views into it. Repeated contents are
+// stored once and share a view: strings are matched by value and Buffers by
+// identity, using the content itself as the map key so nothing is copied to
+// build keys. A precomputed tree thus costs a single allocation holding each
+// distinct blob once. Part arrays are joined, since their parts end up
+// contiguous in the blob anyway.
+function packTree(files) {
+  files = files.map(([relPath, content]) =>
+    [relPath, Array.isArray(content) ? Buffer.concat(content.map(toBuffer)) : content]
+  )
+
+  const views = new Map()
+  let total = 0
+  for (const [, content] of files) {
+    if (!views.has(content)) {
+      views.set(content, null)
+      total += Buffer.byteLength(content)
+    }
+  }
+
+  const blob = Buffer.allocUnsafe(total)
+  let offset = 0
+  for (const content of views.keys()) {
+    const length = Buffer.byteLength(content)
+    const view = blob.subarray(offset, offset + length)
+    if (Buffer.isBuffer(content)) {
+      content.copy(view)
+    } else {
+      view.write(content)
+    }
+    views.set(content, view)
+    offset += length
+  }
+
+  return Object.freeze(files.map(([relPath, content]) =>
+    Object.freeze([relPath, views.get(content)])
+  ))
+}
+
+// Deepest directories needed by the queued files, relative to the base
+// directory. Ancestors of another entry are dropped since a recursive mkdir
+// creates them on the way down.
+function leafDirs(files) {
+  const dirs = [...new Set(files.map(([relPath]) => path.posix.dirname(relPath)))]
+  return dirs.filter(dir => !dirs.some(other =>
+    other !== dir && (dir === '.' || other.startsWith(dir + '/'))
+  ))
+}
+
+// Whether filePath already holds exactly the given parts. The size check is a
+// cheap lstat; contents are only read back when the sizes match.
+async function isUnchanged(filePath, parts) {
+  const size = parts.reduce((sum, part) => sum + part.length, 0)
+  try {
+    const stats = await fs.lstat(filePath)
+    return stats.isFile() && stats.size === size &&
+      Buffer.concat(parts, size).equals(await fs.readFile(filePath))
+  } catch (error) {
+    if (error.code === 'ENOENT') return false
+    throw error
+  }
+}
+
+// Drop the first count bytes from a list of buffers, slicing the part a
+// short write stopped in.
+function skipBytes(parts, count) {
+  let index = 0
+  while (index < parts.length && count >= parts[index].length) {
+    count -= parts[index].length
+    index++
+  }
+  const rest = parts.slice(index)
+  if (count > 0) rest[0] = rest[0].subarray(count)
+  return rest
+}
+
+// Write one file with a bare open/writev/close on pre-encoded buffers,
+// skipping the option parsing done by fs.writeFile. Like fs.writeFile, short
+// writes are retried from where they stopped until every byte is out. Files
+// that already hold the same content are left alone, so re-running a
+// scaffolder dirties no pages.
+async function createFile(filePath, content = '') {
+  const parts = (Array.isArray(content) ? content : [content])
+    .map(toBuffer)
+    .filter(part => part.length > 0)
+  if (await isUnchanged(filePath, parts)) return
+
+  const handle = await fs.open(filePath, 'w', 0o644)
+  try {
+    // Empty content needs no write at all
+    let pending = parts
+    while (pending.length > 0) {
+      const { bytesWritten } = await handle.writev(pending)
+      if (bytesWritten === 0) {
+        throw new Error(`No progress writing ${filePath}`)
+      }
+      pending = skipBytes(pending, bytesWritten)
+    }
+  } finally {
+    await handle.close()
+  }
+}
+
+// Write queued [relPath, content] entries under baseDir. Manifests stay
+// relative and are appended to a base prefix normalized once up front,
+// rather than going through path.join for every entry. Directories are
+// created first in a serial pass, then a fixed pool of workers overlaps the
+// independent writes without flooding the libuv threadpool or running out of
+// file descriptors.
+async function batchCreate(baseDir, files) {
+  // Joining '.' keeps an empty baseDir relative to the cwd ('./'), where
+  // joining path.sep would turn it into the filesystem root
+  const prefix = path.join(baseDir, '.') + path.sep
+
+  for (const dir of leafDirs(files)) {
+    await fs.mkdir(prefix + dir, { recursive: true })
+  }
+
+  let next = 0
+  const worker = async () => {
+    while (next < files.length) {
+      const [relPath, content] = files[next++]
+      await createFile(prefix + relPath, content)
+    }
+  }
+  const workers = Math.min(MAX_CONCURRENT_WRITES, files.length)
+  await Promise.all(Array.from({ length: workers }, worker))
+}
+
+// Flush written files to disk. Call once after every write of a scaffold has
+// finished, including ones made outside batchCreate. On POSIX this is a single
+// sync(2) via the system sync utility rather than an fsync (and journal
+// commit) per file. Windows has no sync utility, so there each of filePaths is
+// fsync'd instead.
+async function syncAll(filePaths) {
+  if (process.platform !== 'win32') {
+    await execFileAsync('sync')
+    return
+  }
+
+  for (const filePath of filePaths) {
+    const handle = await fs.open(filePath, 'r+')
+    try {
+      await handle.sync()
+    } finally {
+      await handle.close()
+    }
+  }
+}
+
+module.exports = { MAX_CONCURRENT_WRITES, flattenTree, packTree, leafDirs, createFile, batchCreate, syncAll }